@@ -68,6 +68,7 @@ class AppConfig(BaseModel):
     batch_size: int = Field(default=100, description="Number of logs to send in each batch")
     timeout: int = Field(default=30, description="Request timeout in seconds")
     max_retries: int = Field(default=3, description="Maximum number of retries for failed requests")
+    max_concurrent_sends: int = Field(default=4, description="Maximum number of batches being sent to Splunk at once")
     
     @classmethod
     def from_env(cls) -> "AppConfig":
@@ -77,7 +78,8 @@ class AppConfig(BaseModel):
             splunk=SplunkConfig.from_env(),
             batch_size=int(os.getenv("BATCH_SIZE", "100")),
             timeout=int(os.getenv("REQUEST_TIMEOUT", "30")),
-            max_retries=int(os.getenv("MAX_RETRIES", "3"))
+            max_retries=int(os.getenv("MAX_RETRIES", "3")),
+            max_concurrent_sends=int(os.getenv("MAX_CONCURRENT_SENDS", "4"))
         )
     
     def validate_config(self) -> None:
@@ -1,21 +1,28 @@
 """Crusoe Cloud API client for fetching audit logs."""
 
 import logging
-import time
 import hmac
 import hashlib
 import base64
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from urllib.parse import urlparse, parse_qs, urlencode
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
 from config import CrusoeConfig
 
 logger = logging.getLogger(__name__)
 
+# Version field of Crusoe's signed Authorization header
+SIGNATURE_VERSION = "1.0"
+
 
 class CrusoeAPIError(Exception):
     """Custom exception for Crusoe API errors."""
@@ -33,6 +40,10 @@ class CrusoeClient:
         """
         self.config = config
         self.session = self._create_session()
+        self._hmac_template: Optional[hmac.HMAC] = None
+        self._audit_logs_url = f"{config.base_url}/organizations/{config.organization_id}/audit-logs"
+        # Authorization header is "Bearer version:access_key_id:signature"; only the signature varies
+        self._signature_auth_prefix = f"Bearer {SIGNATURE_VERSION}:{config.access_key_id}:"
         
     def _create_session(self) -> requests.Session:
         """Create a requests session with retry strategy."""
@@ -42,8 +53,9 @@ class CrusoeClient:
         retry_strategy = Retry(
             total=3,
             status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-            backoff_factor=1
+            allowed_methods=frozenset(["HEAD", "GET", "OPTIONS"]),
+            backoff_factor=1,
+            respect_retry_after_header=True
         )
         
         adapter = HTTPAdapter(max_retries=retry_strategy)
@@ -84,6 +96,29 @@ class CrusoeClient:
         # No authentication configured
         return headers
     
+    def _get_hmac_template(self) -> hmac.HMAC:
+        """Return an HMAC-SHA256 object keyed with the decoded secret access key.
+        
+        The secret is decoded and the HMAC key schedule is set up once, on
+        first use. Callers must ``copy()`` the template before updating it.
+        
+        Returns:
+            Keyed HMAC-SHA256 template
+            
+        Raises:
+            CrusoeAPIError: If the secret key is not valid base64
+        """
+        if self._hmac_template is None:
+            secret_key = self.config.secret_access_key
+            try:
+                # Add padding if needed for base64 decoding
+                decoded_secret = base64.urlsafe_b64decode(secret_key + '=' * (-len(secret_key) % 4))
+            except Exception as e:
+                logger.error(f"Failed to decode secret key: {e}")
+                raise CrusoeAPIError(f"Invalid secret key format: {e}")
+            self._hmac_template = hmac.new(decoded_secret, digestmod=hashlib.sha256)
+        return self._hmac_template
+    
     def _create_crusoe_signature(self, method: str, url: str, params: Optional[Dict] = None, data: Optional[str] = None) -> Dict[str, str]:
         """Create Crusoe Cloud API signature according to their documentation.
         
@@ -113,41 +148,25 @@ class CrusoeClient:
         else:
             canonicalized_query_params = ""
         
-        # Create timestamp exactly like the working example
-        dt = datetime.now(timezone.utc).replace(microsecond=0)
-        timestamp = str(dt).replace(" ", "T")
+        # Create timestamp exactly like the working example (e.g. 2024-01-01T00:00:00+00:00)
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
         
         # Create signature payload exactly like the working example:
         # /v1alpha5/ + path + "\n" + canonicalized_query_params + "\n" + http_verb + "\n" + timestamp + "\n"
         api_version = "/v1alpha5/"
         payload = f"{api_version}{http_path}\n{canonicalized_query_params}\n{method}\n{timestamp}\n"
         
-        # Decode the secret key from base64
-        try:
-            # Add padding if needed for base64 decoding
-            secret_key_padded = self.config.secret_access_key + '=' * (-len(self.config.secret_access_key) % 4)
-            decoded_secret = base64.urlsafe_b64decode(secret_key_padded)
-        except Exception as e:
-            logger.error(f"Failed to decode secret key: {e}")
-            raise CrusoeAPIError(f"Invalid secret key format: {e}")
-        
-        # Create HMAC-SHA256 signature
-        signature_bytes = hmac.new(
-            decoded_secret,
-            payload.encode('ascii'),
-            hashlib.sha256
-        ).digest()
+        # Create HMAC-SHA256 signature from a copy of the pre-keyed template
+        mac = self._get_hmac_template().copy()
+        mac.update(payload.encode('ascii'))
+        signature_bytes = mac.digest()
         
         # Base64 encode the signature (without padding)
-        signature = base64.urlsafe_b64encode(signature_bytes).decode('ascii').rstrip("=")
-        
-        # Create authorization header: Bearer version:access_key_id:signature
-        signature_version = "1.0"
-        auth_value = f"{signature_version}:{self.config.access_key_id}:{signature}"
+        signature = base64.urlsafe_b64encode(signature_bytes).rstrip(b"=").decode('ascii')
         
         return {
             "X-Crusoe-Timestamp": timestamp,
-            "Authorization": f"Bearer {auth_value}"
+            "Authorization": self._signature_auth_prefix + signature
         }
     
     def get_audit_logs(
@@ -173,7 +192,7 @@ class CrusoeClient:
         Raises:
             CrusoeAPIError: If API request fails
         """
-        url = f"{self.config.base_url}/organizations/{self.config.organization_id}/audit-logs"
+        url = self._audit_logs_url
         
         # Build query parameters
         params = {}
@@ -193,13 +212,13 @@ class CrusoeClient:
             logger.info(f"Fetching audit logs from {url} with params: {params}")
             
             # Sign the request (include query params in signature when present)
+            # Session default headers are merged in by requests
             auth_headers = self._sign_request("GET", url, params=params)
-            headers = {**self.session.headers, **auth_headers}
             
-            response = self.session.get(url, params=params, headers=headers, timeout=30)
+            response = self.session.get(url, params=params, headers=auth_headers, timeout=30)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
             logs = data.get("items", [])
             
             logger.info(f"Successfully fetched {len(logs)} audit logs")
@@ -211,32 +230,40 @@ class CrusoeClient:
                 try:
                     error_detail = e.response.json()
                     error_msg += f" - {error_detail}"
-                except:
+                except ValueError:
                     error_msg += f" - Status: {e.response.status_code}"
             
             logger.error(error_msg)
             raise CrusoeAPIError(error_msg) from e
-    
-    def get_audit_logs_paginated(
+        except ValueError as e:
+            error_msg = f"Failed to parse audit logs response: {str(e)}"
+            logger.error(error_msg)
+            raise CrusoeAPIError(error_msg) from e
+
+    def iter_audit_logs_pages(
         self,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
         page_size: int = 100,
-        max_pages: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
-        """Fetch audit logs with pagination support.
+        max_pages: Optional[int] = None,
+        start_offset: int = 0
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of audit logs as they are fetched.
         
         Args:
             start_time: Start time for log filtering
             end_time: End time for log filtering
             page_size: Number of logs per page
             max_pages: Maximum number of pages to fetch (None for all)
+            start_offset: Offset of the first log to fetch (to resume a stream)
             
-        Returns:
-            List of all audit log entries
+        Yields:
+            Non-empty lists of audit log entries, one per page
+            
+        Raises:
+            CrusoeAPIError: If API request fails
         """
-        all_logs = []
-        offset = 0
+        offset = start_offset
         page_count = 0
         
         while True:
@@ -250,32 +277,69 @@ class CrusoeClient:
                     limit=page_size,
                     offset=offset
                 )
-                
-                if not logs:
-                    # No more logs available
-                    break
-                
-                all_logs.extend(logs)
-                offset += len(logs)
-                page_count += 1
-                
-                # If we got fewer logs than page_size, we've reached the end
-                if len(logs) < page_size:
-                    break
-                    
-                # Small delay between requests to be respectful
-                time.sleep(0.1)
-                
             except CrusoeAPIError:
                 # Re-raise API errors
                 raise
             except Exception as e:
                 logger.error(f"Unexpected error during pagination: {str(e)}")
                 break
+            
+            if not logs:
+                # No more logs available
+                break
+            
+            offset += len(logs)
+            page_count += 1
+            yield logs
+            
+            # If we got fewer logs than page_size, we've reached the end
+            # (429 responses are throttled by the session's Retry-After handling)
+            if len(logs) < page_size:
+                break
+    
+    def get_audit_logs_paginated(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        page_size: int = 100,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch audit logs with pagination support.
+        
+        Args:
+            start_time: Start time for log filtering
+            end_time: End time for log filtering
+            page_size: Number of logs per page
+            max_pages: Maximum number of pages to fetch (None for all)
+            
+        Returns:
+            List of all audit log entries
+        """
+        all_logs = []
+        page_count = 0
+        
+        for logs in self.iter_audit_logs_pages(
+            start_time=start_time,
+            end_time=end_time,
+            page_size=page_size,
+            max_pages=max_pages
+        ):
+            all_logs.extend(logs)
+            page_count += 1
         
         logger.info(f"Fetched total of {len(all_logs)} audit logs across {page_count} pages")
         return all_logs
     
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+    
+    def __enter__(self) -> "CrusoeClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def health_check(self) -> bool:
         """Check if the Crusoe API is accessible.
         
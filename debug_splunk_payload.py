@@ -3,7 +3,7 @@
 
 import os
 import json
-from dotenv import load_dotenv
+import traceback
 from config import AppConfig
 from crusoe_client import CrusoeClient
 from splunk_hec import SplunkHECClient
@@ -12,8 +12,6 @@ from datetime import datetime, timedelta, timezone
 def debug_splunk_payload():
     """Debug the exact payload being sent to Splunk."""
     
-    load_dotenv()
-    
     print("=== DEBUGGING SPLUNK HEC PAYLOAD ===")
     
     try:
@@ -50,12 +48,8 @@ def debug_splunk_payload():
         
         # Show what would be sent as the HTTP body
         print(f"\n=== HTTP BODY CONTENT ===")
-        events_data = []
-        for log in logs:
-            event = splunk_client._format_event(log)
-            events_data.append(json.dumps(event))
-        
-        body = '\n'.join(events_data)
+        formatted_events = [splunk_client._format_event(log) for log in logs]
+        body = splunk_client._build_payload(formatted_events).decode('utf-8')
         print(f"Body length: {len(body)} characters")
         print("Body content:")
         print(body)
@@ -99,7 +93,6 @@ def debug_splunk_payload():
         
     except Exception as e:
         print(f"❌ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
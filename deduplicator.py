@@ -177,6 +177,18 @@ class EventDeduplicator:
         # Clean up old entries first
         self._cleanup_old_entries()
         
+        return self._is_seen(event)
+    
+    def _is_seen(self, event: Dict) -> bool:
+        """
+        Check if an event's hash is currently tracked (no expiry cleanup).
+        
+        Args:
+            event: Audit log event dictionary
+            
+        Returns:
+            True if this event's hash is in the tracked set
+        """
         # Generate hash for this event
         event_hash = self._generate_event_hash(event)
         
@@ -203,11 +215,14 @@ class EventDeduplicator:
         if not self.enabled:
             return events
             
+        # Expire old entries once for the whole batch instead of once per event
+        self._cleanup_old_entries()
+        
         unique_events = []
         duplicate_count = 0
         
         for event in events:
-            if not self.is_duplicate(event):
+            if not self._is_seen(event):
                 unique_events.append(event)
             else:
                 duplicate_count += 1
@@ -217,7 +232,7 @@ class EventDeduplicator:
         
         return unique_events
     
-    def mark_events_as_sent(self, events: List[Dict]):
+    def mark_events_as_sent(self, events: List[Dict], persist: bool = True):
         """
         Mark events as successfully sent (after successful Splunk submission).
         
@@ -225,6 +240,8 @@ class EventDeduplicator:
         
         Args:
             events: List of events that were successfully sent
+            persist: Whether to write the state file now; callers marking many
+                batches in a row can pass False and call save_state() once at the end
         """
         if not self.enabled or not events:
             return
@@ -244,6 +261,11 @@ class EventDeduplicator:
             logger.debug(f"Marked {marked_count} events as successfully sent")
             
         # Save state after marking events as sent
+        if persist:
+            self._save_state()
+    
+    def save_state(self):
+        """Persist current state to disk."""
         self._save_state()
     
     def get_stats(self) -> Dict:
@@ -1,11 +1,18 @@
 """Main application for forwarding Crusoe audit logs to Splunk HEC."""
 
 import logging
+import queue
+import random
 import sys
+import threading
 import time
+from collections import deque
+from contextlib import closing, contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 import click
+import requests
 
 from config import AppConfig
 from crusoe_client import CrusoeClient, CrusoeAPIError
@@ -25,6 +32,121 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Return a full-jitter exponential backoff delay in seconds.
+    
+    Args:
+        attempt: Zero-based retry attempt number
+        base: Delay for the first attempt before jitter
+        cap: Upper bound on the delay before jitter
+        
+    Returns:
+        Random delay in [0, min(cap, base * 2**attempt)]
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Check whether a Crusoe API error is worth retrying.
+    
+    Only network-level failures are retried: connection errors, timeouts,
+    and 429/5xx responses the session's own retries could not get past.
+    HTTP client errors, TLS/certificate failures and malformed responses
+    would fail the same way again.
+    """
+    # SSLError subclasses ConnectionError but retrying won't fix a bad certificate
+    if isinstance(error.__cause__, requests.exceptions.SSLError):
+        return False
+    return isinstance(error.__cause__, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        requests.exceptions.RetryError
+    ))
+
+
+def _parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC.
+    
+    Args:
+        value: ISO 8601 timestamp string
+        
+    Returns:
+        Parsed datetime
+        
+    Raises:
+        ValueError: If the string is not a valid ISO 8601 timestamp
+    """
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], label: str) -> Iterator[None]:
+    """Add the wall-clock time spent inside the block to ``timings[label]``.
+    
+    Args:
+        timings: Accumulated seconds per phase label
+        label: Phase to charge the elapsed time to
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[label] = timings.get(label, 0.0) + time.perf_counter() - started
+
+
+def _prefetch(iterable: Iterable[Any], max_pending: int = 4) -> Iterator[Any]:
+    """Iterate over an iterable on a background thread, buffering ahead.
+    
+    Lets the producer (e.g. Crusoe page fetches) run while the consumer is
+    busy with the previous item (e.g. a Splunk send). At most max_pending
+    items are buffered. Exceptions raised by the iterable are re-raised in
+    the consumer, and the producer stops if the consumer exits early.
+    
+    Args:
+        iterable: Items to produce on the background thread
+        max_pending: Maximum number of items buffered ahead of the consumer
+        
+    Yields:
+        Items of iterable, in order
+    """
+    pending: "queue.Queue[tuple]" = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    
+    def put(entry: tuple) -> bool:
+        while not stop.is_set():
+            try:
+                pending.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+        except Exception as e:
+            put((False, e))
+            return
+        put((False, None))
+    
+    producer = threading.Thread(target=produce, name="log-prefetch", daemon=True)
+    producer.start()
+    
+    try:
+        while True:
+            has_item, value = pending.get()
+            if has_item:
+                yield value
+            elif value is None:
+                return
+            else:
+                raise value
+    finally:
+        stop.set()
+
+
 class LogForwarder:
     """Main class for forwarding Crusoe audit logs to Splunk HEC."""
     
@@ -37,7 +159,7 @@ class LogForwarder:
         """
         self.config = config
         self.crusoe_client = CrusoeClient(config.crusoe)
-        self.splunk_client = SplunkHECClient(config.splunk)
+        self.splunk_client = SplunkHECClient(config.splunk, max_concurrent_requests=config.max_concurrent_sends)
         self.deduplicator = deduplicator
     
     def health_check(self) -> bool:
@@ -61,6 +183,72 @@ class LogForwarder:
         logger.info("All health checks passed")
         return True
     
+    def _iter_log_pages(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream audit log pages from Crusoe, retrying transient failures.
+        
+        A failed page fetch is retried with backoff and the stream resumes
+        at the failed page, so pages that were already yielded (and possibly
+        sent) are not fetched again.
+        
+        Args:
+            start_time: Start time for log filtering
+            end_time: End time for log filtering
+            
+        Yields:
+            Pages of audit log entries
+            
+        Raises:
+            CrusoeAPIError: If the error is permanent or retries are exhausted
+        """
+        offset = 0
+        attempt = 0
+        
+        while True:
+            try:
+                for page in self.crusoe_client.iter_audit_logs_pages(
+                    start_time=start_time,
+                    end_time=end_time,
+                    page_size=self.config.batch_size,
+                    start_offset=offset
+                ):
+                    offset += len(page)
+                    attempt = 0
+                    yield page
+                return
+            except CrusoeAPIError as e:
+                if attempt >= self.config.max_retries or not _is_transient_error(e):
+                    raise
+                
+                delay = _backoff_delay(attempt)
+                attempt += 1
+                logger.warning(f"Transient error fetching audit logs at offset {offset} (retry {attempt}/{self.config.max_retries} in {delay:.1f}s): {str(e)}")
+                time.sleep(delay)
+    
+    def _complete_send(self, future: "Future[tuple[int, List[Dict[str, Any]]]]") -> int:
+        """Wait for a Splunk send to finish and record its events as sent.
+        
+        The deduplicator is only updated in memory; forward_logs saves its
+        state once all sends have completed.
+        
+        Args:
+            future: Future returned by submitting ``send_events_batch``
+            
+        Returns:
+            Number of events successfully sent
+        """
+        batch_sent, successfully_sent_events = future.result()
+        
+        # Mark events as successfully sent ONLY after successful Splunk submission
+        if self.deduplicator and successfully_sent_events:
+            self.deduplicator.mark_events_as_sent(successfully_sent_events, persist=False)
+            logger.debug(f"Marked {len(successfully_sent_events)} events as successfully sent to deduplication tracker")
+        
+        return batch_sent
+    
     def forward_logs(
         self,
         start_time: Optional[datetime] = None,
@@ -69,6 +257,13 @@ class LogForwarder:
     ) -> int:
         """Forward audit logs from Crusoe to Splunk HEC.
         
+        Logs are streamed page by page: each page is deduplicated and sent
+        to Splunk as soon as it is fetched, so memory use stays bounded by
+        the page size regardless of the time range. The next pages are
+        fetched from Crusoe in the background while the current one is
+        being sent, and up to ``max_concurrent_sends`` pages are sent to
+        Splunk at once.
+        
         Args:
             start_time: Start time for log filtering
             end_time: End time for log filtering
@@ -77,49 +272,94 @@ class LogForwarder:
         Returns:
             Number of logs successfully forwarded
         """
+        fetched_count = 0
+        unique_count = 0
+        sent_count = 0
+        max_in_flight = max(1, self.config.max_concurrent_sends)
+        in_flight: deque = deque()
+        send_error: Optional[Exception] = None
+        timings: Dict[str, float] = {'fetch': 0.0, 'send': 0.0}
+        started = time.perf_counter()
+        
         try:
-            # Fetch audit logs from Crusoe
             logger.info("Fetching audit logs from Crusoe API...")
-            logs = self.crusoe_client.get_audit_logs_paginated(
-                start_time=start_time,
-                end_time=end_time,
-                page_size=self.config.batch_size
-            )
+            if dry_run:
+                logger.info("Dry run mode - not sending logs to Splunk")
+            
+            # Closing the page stream stops the prefetch thread even if the loop raises
+            with closing(_prefetch(self._iter_log_pages(start_time=start_time, end_time=end_time))) as pages, \
+                    ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="hec-send") as executor:
+                try:
+                    while True:
+                        with _timed(timings, 'fetch'):
+                            logs = next(pages, None)
+                        if logs is None:
+                            break
+                        
+                        fetched_count += len(logs)
+                        
+                        # Apply deduplication if enabled
+                        if self.deduplicator:
+                            original_count = len(logs)
+                            logs = self.deduplicator.filter_duplicates(logs)
+                            if len(logs) < original_count:
+                                logger.info(f"Deduplication: {original_count} -> {len(logs)} events ({original_count - len(logs)} duplicates filtered)")
+                        
+                        if not logs:
+                            continue
+                        
+                        if dry_run:
+                            # Show the first 5 logs of the run
+                            for i, log in enumerate(logs[:max(0, 5 - unique_count)], start=unique_count + 1):
+                                logger.info(f"Sample log {i}: {log}")
+                            unique_count += len(logs)
+                            continue
+                        
+                        unique_count += len(logs)
+                        
+                        # Send this page to Splunk HEC without waiting for earlier pages
+                        in_flight.append(executor.submit(
+                            self.splunk_client.send_events_batch,
+                            logs,
+                            batch_size=self.config.batch_size
+                        ))
+                        if len(in_flight) >= max_in_flight:
+                            with _timed(timings, 'send'):
+                                sent_count += self._complete_send(in_flight.popleft())
+                finally:
+                    # Wait for every send still in flight so successful ones are
+                    # recorded even if an earlier one failed; the first failure is
+                    # raised once all of them have completed
+                    with _timed(timings, 'send'):
+                        while in_flight:
+                            try:
+                                sent_count += self._complete_send(in_flight.popleft())
+                            except Exception as e:
+                                logger.error(f"Failed to send a batch to Splunk HEC: {str(e)}")
+                                send_error = send_error or e
+                    
+                    # Write the dedup state file once per run rather than once per page
+                    if self.deduplicator and sent_count:
+                        self.deduplicator.save_state()
+            
+            if send_error:
+                raise send_error
             
-            if not logs:
+            # Time spent blocked on each side shows which one is the bottleneck
+            logger.info(f"Forwarding took {time.perf_counter() - started:.2f}s (waiting on Crusoe: {timings['fetch']:.2f}s, waiting on Splunk: {timings['send']:.2f}s)")
+            
+            if not fetched_count:
                 logger.info("No audit logs found")
                 return 0
             
-            logger.info(f"Retrieved {len(logs)} audit logs")
-            
-            # Apply deduplication if enabled
-            if self.deduplicator:
-                original_count = len(logs)
-                logs = self.deduplicator.filter_duplicates(logs)
-                if len(logs) < original_count:
-                    logger.info(f"Deduplication: {original_count} -> {len(logs)} events ({original_count - len(logs)} duplicates filtered)")
+            logger.info(f"Retrieved {fetched_count} audit logs ({unique_count} unique)")
             
-            if not logs:
+            if not unique_count:
                 logger.info("No unique logs to forward after deduplication")
                 return 0
             
             if dry_run:
-                logger.info("Dry run mode - not sending logs to Splunk")
-                for i, log in enumerate(logs[:5]):  # Show first 5 logs
-                    logger.info(f"Sample log {i+1}: {log}")
-                return len(logs)
-            
-            # Send logs to Splunk HEC
-            logger.info("Sending logs to Splunk HEC...")
-            sent_count, successfully_sent_events = self.splunk_client.send_events_batch(
-                logs,
-                batch_size=self.config.batch_size
-            )
-            
-            # Mark events as successfully sent ONLY after successful Splunk submission
-            if self.deduplicator and successfully_sent_events:
-                self.deduplicator.mark_events_as_sent(successfully_sent_events)
-                logger.debug(f"Marked {len(successfully_sent_events)} events as successfully sent to deduplication tracker")
+                return unique_count
             
             return sent_count
             
@@ -224,14 +464,14 @@ def forward_range(ctx, start_time, end_time, dry_run):
     
     if start_time:
         try:
-            start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+            start_dt = _parse_iso_datetime(start_time)
         except ValueError:
             click.echo(f"❌ Invalid start time format: {start_time}")
             sys.exit(1)
     
     if end_time:
         try:
-            end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+            end_dt = _parse_iso_datetime(end_time)
         except ValueError:
             click.echo(f"❌ Invalid end time format: {end_time}")
             sys.exit(1)
@@ -254,29 +494,39 @@ def forward_range(ctx, start_time, end_time, dry_run):
 
 
 @cli.command()
-@click.option('--interval', default=300, help='Interval between runs in seconds (default: 5 minutes)')
+@click.option('--interval', default=300, help='Initial interval between runs in seconds (default: 5 minutes)')
+@click.option('--min-interval', default=60, help='Shortest interval used while catching up on full batches (default: 60)')
+@click.option('--max-interval', default=1800, help='Longest interval used while no new logs arrive (default: 30 minutes)')
 @click.option('--lookback', default=600, help='Initial lookback period in seconds (default: 10 minutes)')
 @click.option('--enable-dedup/--disable-dedup', default=True, help='Enable/disable event deduplication (default: enabled)')
 @click.option('--dedup-buffer-seconds', default=60, help='Extra buffer seconds for deduplication time window (default: 60)')
 @click.pass_context
-def daemon(ctx, interval, lookback, enable_dedup, dedup_buffer_seconds):
+def daemon(ctx, interval, min_interval, max_interval, lookback, enable_dedup, dedup_buffer_seconds):
     """Run in daemon mode, continuously forwarding logs.
     
     On first run, fetches logs from the last 'lookback' seconds.
     On subsequent runs, fetches only logs since the last successful run to prevent duplicates.
+    The interval doubles after a cycle with no new logs (up to --max-interval),
+    halves after a cycle that filled a whole batch (down to --min-interval), and
+    returns to --interval after any other cycle that sent logs.
     """
     forwarder = ctx.obj['forwarder']
+    batch_size = forwarder.config.batch_size
+    
+    # Keep the starting interval inside the adaptive bounds
+    min_interval = max(1, min(min_interval, interval))
+    max_interval = max(max_interval, interval)
     
     # Initialize deduplicator if enabled
     deduplicator = None
     if enable_dedup:
-        # Calculate total tracking window: interval + overlap (30s) + user buffer
-        tracking_window = interval + 30 + dedup_buffer_seconds
+        # Calculate total tracking window: longest interval + overlap (30s) + user buffer
+        tracking_window = max_interval + 30 + dedup_buffer_seconds
         deduplicator = EventDeduplicator(
             tracking_window_seconds=tracking_window,
             enabled=True
         )
-        logger.info(f"Deduplication enabled: tracking window = {tracking_window}s (interval:{interval} + overlap:30 + buffer:{dedup_buffer_seconds})")
+        logger.info(f"Deduplication enabled: tracking window = {tracking_window}s (max interval:{max_interval} + overlap:30 + buffer:{dedup_buffer_seconds})")
         
         # Update forwarder with deduplicator
         forwarder.deduplicator = deduplicator
@@ -287,10 +537,12 @@ def daemon(ctx, interval, lookback, enable_dedup, dedup_buffer_seconds):
     else:
         logger.info("Deduplication disabled")
     
-    logger.info(f"Starting daemon mode: forwarding logs every {interval} seconds")
+    logger.info(f"Starting daemon mode: forwarding logs every {interval} seconds (adaptive between {min_interval} and {max_interval} seconds)")
     logger.info(f"Initial lookback period: {lookback} seconds")
     
     last_run_time = None
+    consecutive_failures = 0
+    current_interval = interval
     
     while True:
         try:
@@ -322,6 +574,16 @@ def daemon(ctx, interval, lookback, enable_dedup, dedup_buffer_seconds):
             
             # Update last run time only on successful completion
             last_run_time = end_time
+            consecutive_failures = 0
+            
+            # Poll less often while idle and catch up faster during bursts;
+            # once logs flow at a normal rate, go back to the configured interval
+            if sent_count == 0:
+                current_interval = min(max_interval, current_interval * 2)
+            elif sent_count >= batch_size:
+                current_interval = max(min_interval, current_interval // 2)
+            else:
+                current_interval = interval
             
         except KeyboardInterrupt:
             logger.info("Daemon mode interrupted by user")
@@ -330,9 +592,21 @@ def daemon(ctx, interval, lookback, enable_dedup, dedup_buffer_seconds):
             logger.error(f"Error in daemon cycle: {str(e)}")
             # Continue running even if one cycle fails
             # Don't update last_run_time on failure to retry the same period
+            consecutive_failures += 1
+        
+        sleep_seconds = current_interval
+        if consecutive_failures:
+            # Back off with jitter (at most one extra interval, reached after
+            # four failures) so repeated failures don't retry in lockstep
+            # against a struggling upstream
+            sleep_seconds += _backoff_delay(
+                consecutive_failures - 1,
+                base=current_interval / 8,
+                cap=current_interval
+            )
         
-        logger.info(f"Sleeping for {interval} seconds...")
-        time.sleep(interval)
+        logger.info(f"Sleeping for {sleep_seconds:.0f} seconds...")
+        time.sleep(sleep_seconds)
 
 
 @cli.command()
@@ -398,6 +672,7 @@ def config_check(ctx):
     click.echo(f"  Batch Size: {config.batch_size}")
     click.echo(f"  Request Timeout: {config.timeout}s")
     click.echo(f"  Max Retries: {config.max_retries}")
+    click.echo(f"  Max Concurrent Sends: {config.max_concurrent_sends}")
 
 
 if __name__ == '__main__':
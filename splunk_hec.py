@@ -6,9 +6,14 @@ import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
 from config import SplunkConfig
 
 logger = logging.getLogger(__name__)
@@ -22,13 +27,16 @@ class SplunkHECError(Exception):
 class SplunkHECClient:
     """Client for sending events to Splunk HTTP Event Collector."""
     
-    def __init__(self, config: SplunkConfig):
+    def __init__(self, config: SplunkConfig, max_concurrent_requests: int = 1):
         """Initialize the Splunk HEC client.
         
         Args:
             config: Splunk configuration object
+            max_concurrent_requests: Number of threads that may send through the
+                client at once; the connection pool is sized to keep them all
         """
         self.config = config
+        self.max_concurrent_requests = max_concurrent_requests
         self.session = self._create_session()
         
     def _create_session(self) -> requests.Session:
@@ -39,11 +47,16 @@ class SplunkHECClient:
         retry_strategy = Retry(
             total=3,
             status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "POST", "OPTIONS"],
-            backoff_factor=1
+            allowed_methods=frozenset(["HEAD", "GET", "POST", "OPTIONS"]),
+            backoff_factor=1,
+            respect_retry_after_header=True
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Keep a pooled connection for every concurrent sender
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_maxsize=max(DEFAULT_POOLSIZE, self.max_concurrent_requests)
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -95,6 +108,32 @@ class SplunkHECClient:
         
         return event
     
+    def _build_payload(self, formatted_events: List[Dict[str, Any]]) -> bytes:
+        """Encode formatted events as an NDJSON (newline-delimited JSON) body.
+        
+        Args:
+            formatted_events: Events already formatted for Splunk HEC
+            
+        Returns:
+            UTF-8 encoded request body
+        """
+        return b"\n".join(self._encode_event(event) for event in formatted_events)
+    
+    @staticmethod
+    def _encode_event(event: Dict[str, Any]) -> bytes:
+        """Serialize a single event to JSON bytes.
+        
+        Uses orjson when available, falling back to the standard library for
+        values orjson rejects (e.g. integers wider than 64 bits or non-string
+        dict keys).
+        """
+        if orjson:
+            try:
+                return orjson.dumps(event)
+            except TypeError:
+                pass
+        return json.dumps(event).encode('utf-8')
+    
     def send_events(self, log_entries: List[Dict[str, Any]]) -> bool:
         """Send multiple audit log entries to Splunk HEC.
         
@@ -113,9 +152,7 @@ class SplunkHECClient:
         
         # Format events for Splunk HEC
         formatted_events = [self._format_event(entry) for entry in log_entries]
-        
-        # Convert to NDJSON format (newline-delimited JSON)
-        payload = "\n".join(json.dumps(event) for event in formatted_events)
+        payload = self._build_payload(formatted_events)
         
         try:
             logger.info(f"Sending {len(log_entries)} events to Splunk HEC")
@@ -142,7 +179,7 @@ class SplunkHECClient:
                 try:
                     error_detail = e.response.json()
                     error_msg += f" - {error_detail}"
-                except:
+                except ValueError:
                     error_msg += f" - Status: {e.response.status_code}"
             
             logger.error(error_msg)
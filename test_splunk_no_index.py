@@ -3,8 +3,9 @@
 
 import os
 import json
+import hashlib
+import traceback
 import requests
-from dotenv import load_dotenv
 from config import AppConfig
 from crusoe_client import CrusoeClient
 from datetime import datetime, timedelta, timezone
@@ -12,8 +13,6 @@ from datetime import datetime, timedelta, timezone
 def test_splunk_no_index():
     """Test sending events to Splunk without specifying an index."""
     
-    load_dotenv()
-    
     print("=== TESTING SPLUNK WITHOUT INDEX ===")
     
     try:
@@ -39,7 +38,6 @@ def test_splunk_no_index():
         print(f"Testing with log: {log.get('action')} by {log.get('actor_email')}")
         
         # Format event WITHOUT index
-        import hashlib
         unique_fields = [
             log.get('start_time', ''),
             log.get('actor_id', ''),
@@ -62,21 +60,22 @@ def test_splunk_no_index():
         event_with_index = event_no_index.copy()
         event_with_index["index"] = "main"
         
-        headers = {
+        # Reuse one keep-alive connection for all test posts
+        session = requests.Session()
+        session.headers.update({
             "Authorization": f"Splunk {config.splunk.hec_token}",
             "Content-Type": "application/json"
-        }
+        })
+        session.verify = config.splunk.verify_ssl
         
         # Test 1: Without index
         print(f"\n=== TEST 1: WITHOUT INDEX ===")
         body1 = json.dumps(event_no_index)
         print(f"Payload: {body1}")
         
-        response1 = requests.post(
+        response1 = session.post(
             config.splunk.hec_url,
-            headers=headers,
             data=body1,
-            verify=config.splunk.verify_ssl,
             timeout=30
         )
         
@@ -88,11 +87,9 @@ def test_splunk_no_index():
         body2 = json.dumps(event_with_index)
         print(f"Payload: {body2}")
         
-        response2 = requests.post(
+        response2 = session.post(
             config.splunk.hec_url,
-            headers=headers,
             data=body2,
-            verify=config.splunk.verify_ssl,
             timeout=30
         )
         
@@ -105,11 +102,9 @@ def test_splunk_no_index():
         event_with_default["index"] = "default"
         body3 = json.dumps(event_with_default)
         
-        response3 = requests.post(
+        response3 = session.post(
             config.splunk.hec_url,
-            headers=headers,
             data=body3,
-            verify=config.splunk.verify_ssl,
             timeout=30
         )
         
@@ -128,7 +123,6 @@ def test_splunk_no_index():
         
     except Exception as e:
         print(f"❌ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
@@ -3,9 +3,9 @@
 
 import os
 import json
+import traceback
 import requests
 import hashlib
-from dotenv import load_dotenv
 from config import AppConfig
 from crusoe_client import CrusoeClient
 from datetime import datetime, timedelta, timezone
@@ -13,8 +13,6 @@ from datetime import datetime, timedelta, timezone
 def test_with_without_id():
     """Test sending the same event with and without the ID field."""
     
-    load_dotenv()
-    
     print("=== TESTING WITH AND WITHOUT EVENT ID ===")
     
     try:
@@ -61,21 +59,22 @@ def test_with_without_id():
         event_with_id = base_event.copy()
         event_with_id["id"] = event_id
         
-        headers = {
+        # Reuse one keep-alive connection for all test posts
+        session = requests.Session()
+        session.headers.update({
             "Authorization": f"Splunk {config.splunk.hec_token}",
             "Content-Type": "application/json"
-        }
+        })
+        session.verify = config.splunk.verify_ssl
         
         # Test 1: WITHOUT ID (old working format)
         print(f"\n=== TEST 1: WITHOUT EVENT ID (OLD FORMAT) ===")
         body1 = json.dumps(base_event)
         print(f"Payload: {body1}")
         
-        response1 = requests.post(
+        response1 = session.post(
             config.splunk.hec_url,
-            headers=headers,
             data=body1,
-            verify=config.splunk.verify_ssl,
             timeout=30
         )
         
@@ -87,11 +86,9 @@ def test_with_without_id():
         body2 = json.dumps(event_with_id)
         print(f"Payload: {body2}")
         
-        response2 = requests.post(
+        response2 = session.post(
             config.splunk.hec_url,
-            headers=headers,
             data=body2,
-            verify=config.splunk.verify_ssl,
             timeout=30
         )
         
@@ -111,7 +108,6 @@ def test_with_without_id():
         
     except Exception as e:
         print(f"❌ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":